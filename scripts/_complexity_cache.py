@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Complexity Results Cache
+Shared loader that memoizes parsed JSON result files across script runs.
+"""
+
+import os
+import hashlib
+import pickle
+import stat
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+# Fastest available JSON codec: orjson, else ujson for parsing, else the stdlib
+try:
+    import orjson
+
+    loads_json = orjson.loads
+
+    def dumps_json(obj, indent: bool = False) -> bytes:
+        """Serialize to UTF-8 JSON bytes"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+except ImportError:
+    import json
+
+    try:
+        from ujson import loads as loads_json
+    except ImportError:
+        loads_json = json.loads
+
+    def dumps_json(obj, indent: bool = False) -> bytes:
+        """Serialize to UTF-8 JSON bytes"""
+        return json.dumps(obj, indent=2 if indent else None).encode('utf-8')
+
+# Per-user location: entries are unpickled, so nobody else may be able to write them
+CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')) / 'complexity-scripts'
+
+def _private_cache_dir() -> bool:
+    """Create the cache directory if needed; True if only the current user can write to it"""
+    try:
+        CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        st = os.lstat(CACHE_DIR)
+    except OSError:
+        return False
+    if not stat.S_ISDIR(st.st_mode):
+        return False
+    if hasattr(os, 'getuid'):
+        # Reject a directory planted by another user or opened up to group/others
+        return st.st_uid == os.getuid() and not st.st_mode & 0o022
+    return True
+
+def _cache_path(raw: bytes) -> Path:
+    """Build the cache entry path for a file's exact content"""
+    # Hashing the bytes is far cheaper than parsing them, and unlike mtime/size it can't go stale
+    return CACHE_DIR / f"{hashlib.blake2b(raw).hexdigest()}.pkl"
+
+def _read_bytes(filename: str, size: int) -> bytes:
+    """Read a whole file with a single unbuffered read of its known size"""
+    fd = os.open(filename, os.O_RDONLY)
+    try:
+        return os.read(fd, size)
+    finally:
+        os.close(fd)
+
+def load_cached_json(filename: str) -> Dict:
+    """Load a JSON file, reusing the pickled result of a previous parse"""
+    try:
+        raw = _read_bytes(filename, os.stat(filename).st_size)
+    except FileNotFoundError:
+        return {}
+
+    private = _private_cache_dir()
+    cache_file = _cache_path(raw)
+    if private:
+        try:
+            return pickle.loads(cache_file.read_bytes())
+        except Exception:
+            pass
+
+    try:
+        data = loads_json(raw)
+    except ValueError:
+        return {}
+
+    if not private:
+        return data
+
+    # Write to a temp file first so concurrent readers never see a partial entry
+    try:
+        fd, tmp_name = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_name, cache_file)
+    except OSError:
+        pass
+
+    return data
+
+def load_cached_json_many(*filenames: str) -> List[Dict]:
+    """Load several JSON files concurrently, returned in argument order"""
+    with ThreadPoolExecutor(max_workers=len(filenames) or 1) as ex:
+        return list(ex.map(load_cached_json, filenames))
@@ -0,0 +1,582 @@
+#!/usr/bin/env python3
+"""
+Complexity Reporting CLI for Memory Bank System
+Runs the threshold check, alert and PR summary steps from one interpreter.
+
+Usage:
+    python scripts/complexity.py check    # compare against baseline, exit 1 if exceeded
+    python scripts/complexity.py alert    # write complexity-alert.md
+    python scripts/complexity.py summary  # write complexity-summary.md
+    python scripts/complexity.py all      # all of the above, sharing parsed results
+"""
+
+import argparse
+import io
+import json
+import re
+import sys
+from itertools import chain, islice
+from operator import itemgetter
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from _complexity_cache import load_cached_json, load_cached_json_many
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Markdown templates for generate_report; parsed once, filled per report/file
+_REPORT_HEADER_TMPL = """# 🚨 COMPLEXITY THRESHOLD REPORT
+**Generated:** {timestamp}
+
+## 📊 SUMMARY
+- Files checked: {files_checked}
+- Files exceeded threshold: {files_exceeded}
+- Total baseline complexity: {total_baseline}
+- Total current complexity: {total_current:.1f}
+
+"""
+
+_REPORT_FILE_TMPL = """### {file}
+- **Current Score:** {current_score_fmt}
+- **Baseline:** {baseline_score}
+- **Threshold:** {threshold}
+- **Excess:** {excess_fmt}%
+- **Size:** {size_kb:.1f} KB, {line_count} lines
+
+"""
+
+_LIST_ITEM_TMPL = "- {}\n"
+
+class ComplexityThresholdChecker:
+    __slots__ = (
+        'baseline',
+        'threshold_multiplier',
+        '_baseline_total',
+        '_baseline_by_basename',
+        '_baseline_re',
+    )
+
+    def __init__(self):
+        # Baseline complexity scores (current state)
+        self.baseline = {
+            'workflow-level4.mdc': 80,
+            'reflection-comprehensive.mdc': 70,
+            'architectural-planning.mdc': 90,
+            'phased-implementation.mdc': 75,
+            'main-optimized.mdc': 60,
+            'hierarchical-rule-loading.mdc': 45,
+            'mode-transition-optimization.mdc': 40,
+            'optimization-integration.mdc': 50,
+            'optimized-workflow-level1.mdc': 30,
+            'optimized-creative-template.mdc': 35
+        }
+        
+        self.threshold_multiplier = 2.0  # 2x baseline
+        self._baseline_total = sum(self.baseline.values())
+        
+        # Baseline lookup: exact basename first, then a single regex scan for
+        # paths that merely contain a baseline name (longest names win)
+        self._baseline_by_basename = dict(self.baseline)
+        self._baseline_re = re.compile(
+            "|".join(map(re.escape, sorted(self.baseline, key=len, reverse=True)))
+        )
+
+    def find_baseline(self, file_path: str) -> Optional[str]:
+        """Find the baseline entry matching a file path"""
+        name = Path(file_path).name
+        if name in self._baseline_by_basename:
+            return name
+        match = self._baseline_re.search(file_path)
+        return match.group(0) if match else None
+
+    def load_static_results(self) -> Dict:
+        """Load static analysis results"""
+        results = load_cached_json('static-complexity-results.json')
+        if not results:
+            print("❌ No static complexity results found")
+        return results
+
+    def load_gpt_results(self) -> Dict:
+        """Load GPT analysis results"""
+        results = load_cached_json('gpt-complexity-results.json')
+        if not results:
+            print("⚠️  No GPT complexity results found")
+        return results
+
+    def load_results(self) -> Tuple[Dict, Dict]:
+        """Load static and GPT analysis results concurrently"""
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            static_future = ex.submit(self.load_static_results)
+            gpt_future = ex.submit(self.load_gpt_results)
+            return static_future.result(), gpt_future.result()
+
+    def check_threshold(self, static_results: Optional[Dict] = None,
+                        gpt_results: Optional[Dict] = None) -> Dict:
+        """Check if complexity exceeds threshold"""
+        if static_results is None and gpt_results is None:
+            static_results, gpt_results = self.load_results()
+        if static_results is None:
+            static_results = self.load_static_results()
+        if gpt_results is None:
+            gpt_results = self.load_gpt_results()
+        timestamp = datetime.now().isoformat()
+        
+        threshold_report = {
+            'timestamp': timestamp,
+            'threshold_exceeded': False,
+            'exceeded_files': [],
+            'warnings': [],
+            'recommendations': [],
+            'summary': {
+                'files_checked': 0,
+                'files_exceeded': 0,
+                'total_baseline': self._baseline_total,
+                'total_current': 0
+            }
+        }
+        
+        # Check static analysis results
+        summary = threshold_report['summary']
+        exceeded_files = threshold_report['exceeded_files']
+        warnings = threshold_report['warnings']
+        recommendations = threshold_report['recommendations']
+        
+        if file_analysis := static_results.get('file_analysis'):
+            for file_path, analysis in file_analysis.items():
+                current_score = analysis['complexity_score']
+                summary['files_checked'] += 1
+                summary['total_current'] += current_score
+                
+                # Find matching baseline file
+                baseline_file = self.find_baseline(file_path)
+                
+                if baseline_file:
+                    baseline_score = self.baseline[baseline_file]
+                    threshold = baseline_score * self.threshold_multiplier
+                    
+                    if current_score > threshold:
+                        threshold_report['threshold_exceeded'] = True
+                        summary['files_exceeded'] += 1
+                        
+                        excess_percentage = ((current_score - threshold) / threshold) * 100
+                        excess_fmt = f"{excess_percentage:.1f}"
+                        
+                        # The *_fmt fields are shared by the console and markdown output
+                        exceeded_info = {
+                            'file': file_path,
+                            'current_score': current_score,
+                            'baseline_score': baseline_score,
+                            'threshold': threshold,
+                            'excess_percentage': excess_percentage,
+                            'size_kb': analysis.get('size_kb', 0),
+                            'line_count': analysis.get('line_count', 0),
+                            'current_score_fmt': f"{current_score:.1f}",
+                            'excess_fmt': excess_fmt
+                        }
+                        
+                        exceeded_files.append(exceeded_info)
+                        
+                        # Generate specific recommendations
+                        if excess_percentage > 50:
+                            recommendations.append(
+                                f"🚨 CRITICAL: {file_path} is {excess_fmt}% over threshold"
+                            )
+                        else:
+                            recommendations.append(
+                                f"⚠️  WARNING: {file_path} exceeds threshold by {excess_fmt}%"
+                            )
+        
+        # Check GPT analysis results
+        if gpt_high := gpt_results.get('high_complexity_files'):
+            for file_info in gpt_high:
+                file_name = file_info['file']
+                complexity = file_info['complexity']
+                cursor_compatibility = file_info['cursor_compatibility']
+                
+                if complexity > 8:  # High complexity threshold
+                    warnings.append(
+                        f"🧠 SEMANTIC: {file_name} has high semantic complexity ({complexity}/10)"
+                    )
+                
+                if cursor_compatibility < 5:  # Low Cursor compatibility
+                    warnings.append(
+                        f"🔧 CURSOR: {file_name} has low Cursor compatibility ({cursor_compatibility}/10)"
+                    )
+        
+        # Generate overall recommendations
+        if threshold_report['threshold_exceeded']:
+            recommendations.append(
+                "💡 Consider splitting complex files into smaller, more manageable modules"
+            )
+            recommendations.append(
+                "💡 Review and simplify mandatory rules that might be causing conflicts"
+            )
+        
+        if len(warnings) > 5:
+            recommendations.append(
+                "💡 Consider consolidating similar rule files to reduce complexity"
+            )
+        
+        # Worst offenders first, so every reader can iterate without re-sorting
+        exceeded_files.sort(key=itemgetter('excess_percentage'), reverse=True)
+        
+        return threshold_report
+
+    def generate_report(self, report: Dict) -> str:
+        """Generate a formatted report"""
+        buf = io.StringIO()
+        buf.write(_REPORT_HEADER_TMPL.format_map(dict(report['summary'], timestamp=report['timestamp'])))
+        
+        # Exceeded files
+        if report['exceeded_files']:
+            buf.write("## 🚨 THRESHOLD EXCEEDED FILES\n")
+            buf.writelines(map(_REPORT_FILE_TMPL.format_map, report['exceeded_files']))
+        
+        # Warnings
+        if report['warnings']:
+            buf.write("## ⚠️  WARNINGS\n")
+            buf.writelines(map(_LIST_ITEM_TMPL.format, report['warnings']))
+            buf.write("\n")
+        
+        # Recommendations
+        if report['recommendations']:
+            buf.write("## 💡 RECOMMENDATIONS\n")
+            buf.writelines(map(_LIST_ITEM_TMPL.format, report['recommendations']))
+            buf.write("\n")
+        
+        return buf.getvalue()
+
+class _Tee:
+    """Text sink that forwards every write to several streams"""
+    __slots__ = ('streams',)
+
+    def __init__(self, *streams: TextIO):
+        self.streams = streams
+
+    def write(self, text: str) -> int:
+        for stream in self.streams:
+            stream.write(text)
+        return len(text)
+
+def _unique(items: Iterable) -> Iterator:
+    """Yield items in first-seen order, skipping duplicates"""
+    seen = set()
+    for item in items:
+        if item not in seen:
+            seen.add(item)
+            yield item
+
+def create_alert(threshold_results: Optional[Dict] = None,
+                 static_results: Optional[Dict] = None,
+                 gpt_results: Optional[Dict] = None,
+                 out: Optional[TextIO] = None) -> Optional[str]:
+    """Create a complexity alert message
+    
+    When `out` is given the alert is streamed into it and None is returned.
+    """
+    if threshold_results is None:
+        threshold_results = load_cached_json('complexity-threshold-results.json')
+    if static_results is None:
+        static_results = load_cached_json('static-complexity-results.json')
+    if gpt_results is None:
+        gpt_results = load_cached_json('gpt-complexity-results.json')
+    
+    buf = out if out is not None else io.StringIO()
+    buf.write("""# 🚨 COMPLEXITY THRESHOLD EXCEEDED
+
+## ⚠️  Critical Issues Detected
+
+""")
+    
+    # Threshold exceeded files
+    if exceeded_files := threshold_results.get('exceeded_files'):
+        buf.write("### 🚨 Files Exceeding Threshold\n")
+        for file_info in exceeded_files:
+            file_name = file_info['file']
+            current = file_info['current_score']
+            baseline = file_info['baseline_score']
+            threshold = file_info['threshold']
+            excess = file_info['excess_percentage']
+            buf.write(f"""- **`{file_name}`**
+  - Current: {current:.1f}
+  - Baseline: {baseline}
+  - Threshold: {threshold}
+  - **Excess: {excess:.1f}%**
+
+""")
+    
+    # High complexity files from static analysis
+    if static_high := static_results.get('high_complexity_files'):
+        buf.write("### 📊 High Complexity Files (Static)\n")
+        for file_info in static_high[:5]:  # Top 5
+            buf.write(f"- **`{file_info['file']}`**: {file_info['score']:.1f} complexity\n")
+        buf.write("\n")
+    
+    # High complexity files from GPT analysis
+    if gpt_high := gpt_results.get('high_complexity_files'):
+        buf.write("### 🧠 High Semantic Complexity (GPT)\n")
+        for file_info in gpt_high[:5]:  # Top 5
+            buf.write(f"- **`{file_info['file']}`**: {file_info['complexity']}/10 complexity\n")
+        buf.write("\n")
+    
+    # Rule conflicts (top 10 distinct)
+    static_conflicts = static_results.get('conflicts_found')
+    gpt_conflicts = gpt_results.get('rule_conflicts')
+    if static_conflicts or gpt_conflicts:
+        buf.write("### ⚠️  Rule Conflicts Detected\n")
+        for conflict in islice(_unique(chain(static_conflicts or (), gpt_conflicts or ())), 10):
+            buf.write(f"- {conflict}\n")
+        buf.write("\n")
+    
+    # Best practice violations (top 10 distinct)
+    static_violations = static_results.get('best_practice_violations')
+    gpt_violations = gpt_results.get('best_practice_violations')
+    if static_violations or gpt_violations:
+        buf.write("### ❌ Best Practice Violations\n")
+        for violation in islice(_unique(chain(static_violations or (), gpt_violations or ())), 10):
+            buf.write(f"- {violation}\n")
+        buf.write("\n")
+    
+    # Cursor compatibility issues
+    if cursor_issues := gpt_results.get('cursor_compatibility_issues'):
+        buf.write("### 🔧 Cursor Compatibility Issues\n")
+        for issue in islice(_unique(cursor_issues), 10):  # Top 10
+            buf.write(f"- {issue}\n")
+        buf.write("\n")
+    
+    # Recommendations (top 10)
+    threshold_recs = threshold_results.get('recommendations')
+    static_recs = static_results.get('recommendations')
+    if threshold_recs or static_recs:
+        buf.write("## 💡 Immediate Actions Required\n")
+        for rec in islice(chain(threshold_recs or (), static_recs or ()), 10):
+            buf.write(f"- {rec}\n")
+        buf.write("\n")
+    
+    # Next steps
+    buf.write("""## 🔍 Next Steps
+1. **Review detailed reports** in the workflow artifacts
+2. **Simplify complex files** by splitting into smaller modules
+3. **Resolve rule conflicts** by consolidating similar rules
+4. **Fix best practice violations** in code examples
+5. **Improve Cursor compatibility** by simplifying complex workflows
+
+## 📊 Reports Available
+- `static-complexity-results.json` - Static analysis results
+- `gpt-complexity-results.json` - Semantic analysis results
+- `complexity-threshold-results.json` - Threshold check results
+- `complexity-threshold-report.md` - Detailed threshold report
+""")
+    
+    return buf.getvalue() if out is None else None
+
+def generate_summary(static_results: Optional[Dict] = None,
+                     gpt_results: Optional[Dict] = None,
+                     threshold_results: Optional[Dict] = None,
+                     out: Optional[TextIO] = None) -> Optional[str]:
+    """Generate a summary of complexity analysis
+    
+    When `out` is given the summary is streamed into it and None is returned.
+    """
+    if static_results is None:
+        static_results = load_cached_json('static-complexity-results.json')
+    if gpt_results is None:
+        gpt_results = load_cached_json('gpt-complexity-results.json')
+    if threshold_results is None:
+        threshold_results = load_cached_json('complexity-threshold-results.json')
+    
+    buf = out if out is not None else io.StringIO()
+    
+    # Static analysis summary
+    if static_results:
+        buf.write(f"""### 📊 Static Analysis
+- **Files analyzed:** {static_results.get('files_analyzed', 0)}
+- **Total complexity:** {static_results.get('total_complexity', 0):.1f}
+""")
+        
+        if summary := static_results.get('summary'):
+            buf.write(f"""- **Average complexity:** {summary.get('average_complexity', 0):.1f}
+- **Total size:** {summary.get('total_size_kb', 0):.1f} KB
+""")
+        
+        if high_complexity := static_results.get('high_complexity_files'):
+            buf.write(f"- **High complexity files:** {len(high_complexity)}\n")
+            for file_info in high_complexity[:3]:  # Show top 3
+                buf.write(f"  - `{file_info['file']}`: {file_info['score']:.1f}\n")
+        
+        if conflicts := static_results.get('conflicts_found'):
+            buf.write(f"- **Rule conflicts:** {len(set(conflicts))}\n")
+        if violations := static_results.get('best_practice_violations'):
+            buf.write(f"- **Best practice violations:** {len(set(violations))}\n")
+    
+    # GPT analysis summary
+    if gpt_results:
+        buf.write(f"""
+### 🧠 Semantic Analysis
+- **Files analyzed:** {gpt_results.get('files_analyzed', 0)}
+""")
+        
+        if high_complexity := gpt_results.get('high_complexity_files'):
+            buf.write(f"- **High semantic complexity:** {len(high_complexity)}\n")
+            for file_info in high_complexity[:3]:  # Show top 3
+                buf.write(f"  - `{file_info['file']}`: {file_info['complexity']}/10\n")
+        
+        if conflicts := gpt_results.get('rule_conflicts'):
+            buf.write(f"- **Rule conflicts:** {len(set(conflicts))}\n")
+        if violations := gpt_results.get('best_practice_violations'):
+            buf.write(f"- **Best practice violations:** {len(set(violations))}\n")
+        if cursor_issues := gpt_results.get('cursor_compatibility_issues'):
+            buf.write(f"- **Cursor compatibility issues:** {len(set(cursor_issues))}\n")
+    
+    # Threshold check summary
+    if threshold_results:
+        summary = threshold_results.get('summary', {})
+        buf.write(f"""
+### 🚨 Threshold Check
+- **Files checked:** {summary.get('files_checked', 0)}
+- **Files exceeded threshold:** {summary.get('files_exceeded', 0)}
+""")
+        
+        if exceeded_files := threshold_results.get('exceeded_files'):
+            buf.write(f"- **Critical files:** {len(exceeded_files)}\n")
+            for file_info in exceeded_files[:3]:  # Show top 3
+                buf.write(f"  - `{file_info['file']}`: {file_info['excess_percentage']:.1f}% over\n")
+        
+        if warnings := threshold_results.get('warnings'):
+            buf.write(f"- **Warnings:** {len(warnings)}\n")
+    
+    # Overall status
+    if threshold_results.get('threshold_exceeded', False):
+        buf.write("""
+### ❌ Status: THRESHOLD EXCEEDED
+Please review the detailed reports in the artifacts.
+""")
+    else:
+        buf.write("""
+### ✅ Status: WITHIN LIMITS
+All files are within complexity thresholds.
+""")
+    
+    # Recommendations (top 5)
+    static_recs = static_results.get('recommendations')
+    threshold_recs = threshold_results.get('recommendations')
+    if static_recs or threshold_recs:
+        buf.write("\n### 💡 Recommendations\n")
+        for rec in islice(chain(static_recs or (), threshold_recs or ()), 5):
+            buf.write(f"- {rec}\n")
+    
+    return buf.getvalue() if out is None else None
+
+def run_check(static_results: Optional[Dict] = None,
+              gpt_results: Optional[Dict] = None) -> Dict:
+    """Run the threshold check, print it and save the reports"""
+    checker = ComplexityThresholdChecker()
+    report = checker.check_threshold(static_results, gpt_results)
+    
+    # Print console output
+    print("🔍 COMPLEXITY THRESHOLD CHECK")
+    print("=" * 50)
+    print(f"Timestamp: {report['timestamp']}")
+    print(f"Files checked: {report['summary']['files_checked']}")
+    print(f"Files exceeded threshold: {report['summary']['files_exceeded']}")
+    
+    if report['exceeded_files']:
+        print(f"\n🚨 THRESHOLD EXCEEDED: {len(report['exceeded_files'])} files")
+        for file_info in report['exceeded_files']:
+            print(f"  - {file_info['file']}: {file_info['excess_fmt']}% over threshold")
+    
+    if report['warnings']:
+        print(f"\n⚠️  WARNINGS: {len(report['warnings'])}")
+        for warning in report['warnings'][:5]:  # Show first 5 warnings
+            print(f"  - {warning}")
+    
+    if report['recommendations']:
+        print(f"\n💡 RECOMMENDATIONS:")
+        for rec in report['recommendations']:
+            print(f"  - {rec}")
+    
+    # Generate and save detailed report
+    detailed_report = checker.generate_report(report)
+    with open('complexity-threshold-report.md', 'w') as f:
+        f.write(detailed_report)
+    
+    # Save JSON report
+    if orjson is not None:
+        payload = orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    else:
+        payload = (json.dumps(report, indent=2) + "\n").encode()
+    Path('complexity-threshold-results.json').write_bytes(payload)
+    
+    print(f"\n📄 Reports saved:")
+    print(f"  - complexity-threshold-report.md")
+    print(f"  - complexity-threshold-results.json")
+    
+    if report['threshold_exceeded']:
+        print("\n❌ COMPLEXITY THRESHOLD EXCEEDED")
+        print("Consider simplifying the affected files.")
+    else:
+        print("\n✅ All files within complexity limits")
+    
+    return report
+
+def run_alert(threshold_results: Optional[Dict] = None,
+              static_results: Optional[Dict] = None,
+              gpt_results: Optional[Dict] = None):
+    """Create the alert and save it to complexity-alert.md"""
+    print("🚨 Complexity alert generated: complexity-alert.md\n")
+    
+    # Stream the alert to the file and the console in one pass
+    with open('complexity-alert.md', 'w') as f:
+        create_alert(threshold_results, static_results, gpt_results, out=_Tee(f, sys.stdout))
+
+def run_summary(static_results: Optional[Dict] = None,
+                gpt_results: Optional[Dict] = None,
+                threshold_results: Optional[Dict] = None):
+    """Create the PR summary and save it to complexity-summary.md"""
+    print("📄 Complexity summary generated: complexity-summary.md\n")
+    
+    # Stream the summary to the file and the console in one pass
+    with open('complexity-summary.md', 'w') as f:
+        generate_summary(static_results, gpt_results, threshold_results, out=_Tee(f, sys.stdout))
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Memory Bank complexity reporting")
+    parser.add_argument('command', choices=['check', 'alert', 'summary', 'all'],
+                        help="step to run ('all' runs check, then alert if needed, then summary)")
+    args = parser.parse_args(argv)
+    
+    if args.command in ('alert', 'summary'):
+        static_results, gpt_results, threshold_results = load_cached_json_many(
+            'static-complexity-results.json',
+            'gpt-complexity-results.json',
+            'complexity-threshold-results.json',
+        )
+        if args.command == 'alert':
+            run_alert(threshold_results, static_results, gpt_results)
+        else:
+            run_summary(static_results, gpt_results, threshold_results)
+        return 0
+    
+    if args.command == 'check':
+        report = run_check()
+    else:
+        # Parse the analyzer outputs once and hand the in-memory dicts to
+        # every step instead of re-reading the artifacts just written
+        static_results, gpt_results = ComplexityThresholdChecker().load_results()
+        report = run_check(static_results, gpt_results)
+        if report['threshold_exceeded']:
+            print()
+            run_alert(report, static_results, gpt_results)
+        print()
+        run_summary(static_results, gpt_results, report)
+    
+    # Exit with error code if threshold exceeded
+    return 1 if report['threshold_exceeded'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
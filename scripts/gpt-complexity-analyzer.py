@@ -1,130 +1,532 @@
 #!/usr/bin/env python3
 """
-GPT-3.5 Semantic Complexity Analyzer for Memory Bank System
+GPT Semantic Complexity Analyzer for Memory Bank System
 Analyzes markdown files for semantic complexity, rule conflicts, and Cursor compatibility.
 """
 
 import os
-import json
+import re
+import argparse
+import random
+import asyncio
+import hashlib
 import time
+from collections import Counter
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+from _complexity_cache import dumps_json, loads_json
 
 try:
     import openai
+    from openai import AsyncOpenAI
 except ImportError:
     print("❌ OpenAI library not found. Install with: pip install openai")
     exit(1)
 
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+MAX_RETRIES = 5  # Retries per request on 429s, 5xx and dropped connections
+BATCH_POLL_INTERVAL = 15  # Seconds between Batch API status checks
+BATCH_CANCEL_TIMEOUT = 300  # Seconds to wait for a timed-out batch to finish cancelling
+SALIENT_CHARS = 2000  # Prompt budget for extracted rule sections
+SMALL_FILE_BYTES = 500  # Files below this size are analyzed several per request
+GROUP_SIZE = 8          # Maximum files per grouped request
+
+# Sections under rule-like headers, and fenced code blocks (including mermaid graphs)
+_RULE_SECTION_RE = re.compile(r'^#{1,3}.*(?:MUST|CRITICAL|MANDATORY|MODE).*\n(?:(?!#).*\n)*',
+                              re.MULTILINE | re.IGNORECASE)
+_FENCED_BLOCK_RE = re.compile(r'^```.*?^```', re.MULTILINE | re.DOTALL)
+
+def _extract_salient(content: str) -> str:
+    """Keep the parts of a file the analyses care about, in document order"""
+    spans = sorted(m.span() for regex in (_RULE_SECTION_RE, _FENCED_BLOCK_RE)
+                   for m in regex.finditer(content))
+    if not spans:
+        return content[:SALIENT_CHARS]
+    
+    # Merge overlapping spans so code blocks inside rule sections appear once
+    merged = [list(spans[0])]
+    for start, end in spans[1:]:
+        if start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return "\n".join(content[start:end] for start, end in merged)[:SALIENT_CHARS]
+
+def _section_schema(list_field: str, rating_field: str, rating_schema: Dict) -> Dict:
+    """Strict JSON schema for one analysis section"""
+    return {
+        "type": "object",
+        "properties": {
+            list_field: {"type": "array", "items": {"type": "string"}},
+            rating_field: rating_schema,
+            "reasoning": {"type": "string"}
+        },
+        "required": [list_field, rating_field, "reasoning"],
+        "additionalProperties": False
+    }
+
+# Structured output schema: the API guarantees replies conform to it
+RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "rule_conflicts": _section_schema(
+            "conflicts", "complexity_rating", {"type": "integer", "description": "1-10"}),
+        "best_practices": _section_schema(
+            "violations", "severity", {"type": "string", "enum": ["low", "medium", "high"]}),
+        "cursor_compatibility": _section_schema(
+            "issues", "cursor_compatibility", {"type": "integer", "description": "1-10"})
+    },
+    "required": ["rule_conflicts", "best_practices", "cursor_compatibility"],
+    "additionalProperties": False
+}
+
+# Grouped requests return one RESPONSE_SCHEMA object per file, tagged with its path
+GROUP_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "files": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {"file": {"type": "string"}, **RESPONSE_SCHEMA["properties"]},
+                "required": ["file", *RESPONSE_SCHEMA["required"]],
+                "additionalProperties": False
+            }
+        }
+    },
+    "required": ["files"],
+    "additionalProperties": False
+}
+
+class AsyncTokenBucket:
+    """Token bucket allowing `rate` requests per `period` seconds, with bursts up to `rate`"""
+    
+    def __init__(self, rate: float, period: float = 60):
+        self.interval = period / rate  # Seconds per token
+        self.burst = period            # Time covered by a full bucket
+        self._tat = 0.0                # Theoretical arrival time of the next request (GCRA)
+    
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        now = time.monotonic()
+        tat = max(self._tat, now)
+        self._tat = tat + self.interval
+        wait = tat + self.interval - self.burst - now
+        if wait > 0:
+            await asyncio.sleep(wait)
+    
+    def drain(self):
+        """Empty the bucket, e.g. after the server reported a rate limit"""
+        self._tat = max(self._tat, time.monotonic() + self.burst)
+    
+    async def __aenter__(self):
+        await self.acquire()
+    
+    async def __aexit__(self, *exc_info):
+        return False
+
+class _JsonEndScanner:
+    """Incrementally tracks bracket depth of a streamed JSON value"""
+    
+    def __init__(self):
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escaped = False
+    
+    def feed(self, text: str) -> int:
+        """Return the offset just past the closing bracket in `text`, or -1"""
+        for i, ch in enumerate(text):
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == '\\':
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = True
+            elif ch in '{[':
+                self.depth += 1
+                self.started = True
+            elif ch in '}]':
+                self.depth -= 1
+                if self.started and self.depth == 0:
+                    return i + 1
+        return -1
+
+def _http_client(max_connections: int):
+    """Pooled HTTP client for the OpenAI SDK, using HTTP/2 when h2 is installed"""
+    # The SDK's subclass keeps its default timeout and redirect settings; older SDKs lack it
+    client_cls = getattr(openai, 'DefaultAsyncHttpxClient', None)
+    if httpx is None or client_cls is None:
+        return None
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+    try:
+        return client_cls(http2=True, limits=limits)
+    except ImportError:
+        return client_cls(limits=limits)
+
+class _StreamingResultsWriter:
+    """Writes a results JSON object whose file_analysis entries arrive one at a time
+    
+    Indented like json.dump(..., indent=2), matching the static analyzer's results.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._tmp_path = f"{path}.tmp"
+        self._f = open(self._tmp_path, 'wb')
+        self._f.write(b'{\n  "file_analysis": {')
+        self._count = 0
+    
+    def add(self, key: str, analysis: Dict):
+        """Append one file's analysis"""
+        separator = b',' if self._count else b''
+        entry = dumps_json(analysis, indent=True).replace(b'\n', b'\n    ')
+        self._f.write(separator + b'\n    ' + dumps_json(key) + b': ' + entry)
+        self._count += 1
+    
+    def close(self, fields: Dict):
+        """Write the aggregate fields and move the finished file into place"""
+        self._f.write(b'\n  }' if self._count else b'}')
+        for key, value in fields.items():
+            value = dumps_json(value, indent=True).replace(b'\n', b'\n  ')
+            self._f.write(b',\n  ' + dumps_json(key) + b': ' + value)
+        self._f.write(b'\n}\n')
+        self._f.close()
+        os.replace(self._tmp_path, self.path)
+    
+    def abort(self):
+        """Discard the partial output"""
+        self._f.close()
+        os.remove(self._tmp_path)
+
 class GPTComplexityAnalyzer:
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, max_concurrency: int = 10,
+                 cache_dir: Optional[str] = '.gpt-cache', model: str = "gpt-4o-mini",
+                 rpm: float = 500):
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
+        self.model = model
+        self.max_concurrency = max_concurrency  # In-flight API requests
+        self.limiter = AsyncTokenBucket(rpm)    # Requests per minute
+        
+        # Exact-match response cache: in-process dict backed by one JSON file per key
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._memo = {}
+        self._used_keys = set()  # Keys this run looked up or stored; the rest is stale
+        
+        self.client = None
         if self.api_key:
-            openai.api_key = self.api_key
+            # One client for the whole run, so connections are reused across requests.
+            # SDK retries are off: _complete and the token bucket are the only retry policy
+            self.client = AsyncOpenAI(api_key=self.api_key, max_retries=0,
+                                      http_client=_http_client(max_concurrency))
         else:
             print("⚠️  No OpenAI API key found. Set OPENAI_API_KEY environment variable.")
             print("   Semantic analysis will be skipped.")
         
-        self.analysis_prompts = {
-            'rule_conflicts': """
-            Analyze this markdown file for potential rule conflicts in Cursor settings:
-            
-            File: {file_path}
-            Content: {content}
-            
-            Look for:
-            1. Contradictory instructions or rules
-            2. Mandatory rules that might conflict with each other
-            3. Complex rule hierarchies that could confuse users
-            4. Rules that might be hard to follow in Cursor's interface
-            5. Dependencies between different rule files
-            6. Rules that might exceed Cursor's context limits
-            
-            Return JSON: {{"conflicts": ["list of specific conflicts"], "complexity_rating": 1-10, "reasoning": "explanation of complexity"}}
-            """,
-            
-            'best_practices': """
-            Analyze this markdown file for code best practice violations:
+        # Checklist shared by the single-file and grouped prompts
+        checklist = """
+            1. rule_conflicts - look for:
+               - Contradictory instructions or rules
+               - Mandatory rules that might conflict with each other
+               - Complex rule hierarchies that could confuse users
+               - Rules that might be hard to follow in Cursor's interface
+               - Dependencies between different rule files
+               - Rules that might exceed Cursor's context limits
             
-            File: {file_path}
-            Content: {content}
+            2. best_practices - check code examples for:
+               - SQL best practice violations (JOIN vs LEFT JOIN, USING vs ON)
+               - Python naming convention violations
+               - Anti-patterns in code examples
+               - Contradictions with recognized coding standards
+               - Inconsistent coding style examples
+               - Outdated or deprecated patterns
             
-            Check for:
-            1. SQL best practice violations (JOIN vs LEFT JOIN, USING vs ON)
-            2. Python naming convention violations
-            3. Anti-patterns in code examples
-            4. Contradictions with recognized coding standards
-            5. Inconsistent coding style examples
-            6. Outdated or deprecated patterns
-            
-            Return JSON: {{"violations": ["list of specific violations"], "severity": "low/medium/high", "reasoning": "explanation"}}
-            """,
+            3. cursor_compatibility - check for:
+               - Rules that might be too complex for Cursor's context limits
+               - Instructions that could confuse users in Cursor settings
+               - Potential conflicts between different rule files
+               - Rules that might not work well in Cursor's environment
+               - Instructions that assume features Cursor might not have
+               - Complex workflows that might be hard to follow in Cursor
+            """
+        
+        # Static instructions; the file itself is appended last so every request
+        # shares the same prefix
+        self.analysis_prompts = {
+            'combined': """
+            Analyze the markdown file at the end of this message, from a Cursor rules repository.
+            """ + checklist + """
+            Example replies:
             
-            'cursor_compatibility': """
-            Analyze this markdown file for Cursor compatibility issues:
+            A short rule file with one fenced SQL example using plain JOIN:
+            {"rule_conflicts": {"conflicts": [], "complexity_rating": 2, "reasoning": "Single focused rule with no dependencies"}, "best_practices": {"violations": ["SQL example uses JOIN where LEFT JOIN is the documented standard"], "severity": "medium", "reasoning": "Example contradicts the repository's own SQL rule"}, "cursor_compatibility": {"issues": [], "cursor_compatibility": 9, "reasoning": "Short and self-contained"}}
             
-            File: {file_path}
-            Content: {content}
+            A long workflow file with nested modes that says both "always ask before editing" and "never interrupt the user":
+            {"rule_conflicts": {"conflicts": ["'always ask before editing' contradicts 'never interrupt the user'"], "complexity_rating": 8, "reasoning": "Several mandatory modes reference each other"}, "best_practices": {"violations": [], "severity": "low", "reasoning": "No code examples"}, "cursor_compatibility": {"issues": ["Multi-phase workflow depends on other rule files being loaded", "Length likely exceeds the context Cursor attaches per rule"], "cursor_compatibility": 3, "reasoning": "Hard to follow inside Cursor settings"}}
             
-            Check for:
-            1. Rules that might be too complex for Cursor's context limits
-            2. Instructions that could confuse users in Cursor settings
-            3. Potential conflicts between different rule files
-            4. Rules that might not work well in Cursor's environment
-            5. Instructions that assume features Cursor might not have
-            6. Complex workflows that might be hard to follow in Cursor
+            Return JSON: {"rule_conflicts": {"conflicts": ["list of specific conflicts"], "complexity_rating": 1-10, "reasoning": "explanation of complexity"}, "best_practices": {"violations": ["list of specific violations"], "severity": "low/medium/high", "reasoning": "explanation"}, "cursor_compatibility": {"issues": ["list of specific issues"], "cursor_compatibility": 1-10, "reasoning": "explanation"}}
+            """
+        }
+        
+        # Several small files per request: same checklist, one reply entry per file
+        self.group_prompt = """
+            Analyze each of the markdown files at the end of this message, from a Cursor rules repository.
+            Every file starts with a "=== FILE: <path> ===" line; analyze each one on its own.
+            """ + checklist + """
+            Example reply for two files:
+            {"files": [{"file": "rules/sql-joins.md", "rule_conflicts": {"conflicts": [], "complexity_rating": 2, "reasoning": "Single focused rule with no dependencies"}, "best_practices": {"violations": ["SQL example uses JOIN where LEFT JOIN is the documented standard"], "severity": "medium", "reasoning": "Example contradicts the repository's own SQL rule"}, "cursor_compatibility": {"issues": [], "cursor_compatibility": 9, "reasoning": "Short and self-contained"}}, {"file": "rules/naming.md", "rule_conflicts": {"conflicts": [], "complexity_rating": 1, "reasoning": "One naming rule"}, "best_practices": {"violations": [], "severity": "low", "reasoning": "Examples follow the rule"}, "cursor_compatibility": {"issues": [], "cursor_compatibility": 10, "reasoning": "Short and self-contained"}}]}
             
-            Return JSON: {{"issues": ["list of specific issues"], "cursor_compatibility": 1-10, "reasoning": "explanation"}}
+            Return JSON: {"files": [{"file": "path exactly as given", "rule_conflicts": {"conflicts": ["list of specific conflicts"], "complexity_rating": 1-10, "reasoning": "explanation of complexity"}, "best_practices": {"violations": ["list of specific violations"], "severity": "low/medium/high", "reasoning": "explanation"}, "cursor_compatibility": {"issues": ["list of specific issues"], "cursor_compatibility": 1-10, "reasoning": "explanation"}}]}, with exactly one entry per file
             """
+
+    def _cache_key(self, prompt: str, analysis_type: str) -> str:
+        """Key a request by model, analysis type and the full prompt text"""
+        return hashlib.sha256(f"{self.model}|{analysis_type}|{prompt}".encode()).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[Dict]:
+        """Return a cached GPT result, if any"""
+        self._used_keys.add(key)
+        if key in self._memo:
+            return self._memo[key]
+        if self.cache_dir is None:
+            return None
+        try:
+            result = loads_json((self.cache_dir / f"{key}.json").read_bytes())
+        except (OSError, ValueError):
+            return None
+        self._memo[key] = result
+        return result
+
+    def _cache_put(self, key: str, result: Dict):
+        """Store a successful GPT result"""
+        self._memo[key] = result
+        self._used_keys.add(key)
+        if self.cache_dir is None:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            (self.cache_dir / f"{key}.json").write_bytes(dumps_json(result))
+        except OSError:
+            pass
+
+    def _prune_cache(self):
+        """Delete cache files for prompts this run no longer sends (edited or removed files, old models)"""
+        if self.cache_dir is None or not self._used_keys:
+            return
+        for entry in self.cache_dir.glob('*.json'):
+            if entry.stem not in self._used_keys:
+                try:
+                    entry.unlink()
+                except OSError:
+                    pass
+
+    def build_prompt(self, content: str, file_path: str, analysis_type: str) -> str:
+        """Render the prompt for one analysis of one file"""
+        excerpt = _extract_salient(content)  # Limit content for token efficiency
+        return f"{self.analysis_prompts[analysis_type]}\n            File: {file_path}\n            Content: {excerpt}\n"
+
+    def build_group_prompt(self, files: List[Tuple[Path, str]]) -> str:
+        """Render one prompt covering several small files"""
+        # Same excerpt as build_prompt, so each reply matches the single-file key it is cached under
+        body = "".join(f"\n            === FILE: {file_path} ===\n{_extract_salient(content)}\n"
+                       for file_path, content in files)
+        return f"{self.group_prompt}{body}"
+
+    def _request_body(self, prompt: str, schema: Dict = RESPONSE_SCHEMA, files: int = 1) -> Dict:
+        """Chat completion parameters shared by realtime and batch requests"""
+        name = "complexity_analysis" if files == 1 else "complexity_analysis_group"
+        return {
+            'model': self.model,
+            'messages': [{"role": "user", "content": prompt}],
+            'response_format': {
+                "type": "json_schema",
+                "json_schema": {"name": name, "strict": True, "schema": schema}
+            },
+            'max_tokens': 1000 * files,
+            'temperature': 0.3
         }
 
-    def analyze_with_gpt(self, content: str, file_path: str, analysis_type: str) -> Dict:
-        """Analyze content using GPT-3.5"""
-        if not self.api_key:
-            return {"error": "OpenAI API key not found"}
+    def _parse_result(self, result_text: str, analysis_type: str, cache_key: str) -> Dict:
+        """Decode a GPT reply and cache it when it is valid JSON"""
+        try:
+            result = loads_json(result_text)
+            self._cache_put(cache_key, result)
+            return result
+        except ValueError:
+            # Structured outputs only yield invalid JSON if the reply hit max_tokens
+            return {
+                "error": "Failed to parse GPT response",
+                "raw_response": result_text,
+                "analysis_type": analysis_type
+            }
+
+    async def _stream_completion(self, body: Dict) -> str:
+        """Stream a completion and stop reading once the JSON object is complete"""
+        stream = await self.client.chat.completions.create(**body, stream=True)
+        scanner = _JsonEndScanner()
+        parts = []
+        try:
+            async for chunk in stream:
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                text = chunk.choices[0].delta.content
+                end = scanner.feed(text)
+                if end >= 0:
+                    parts.append(text[:end])
+                    break
+                parts.append(text)
+        finally:
+            # Closing the connection early stops generation of any trailing tokens
+            await stream.close()
+        return ''.join(parts)
+
+    async def analyze_with_gpt(self, content: str, file_path: str, analysis_type: str,
+                               semaphore: asyncio.Semaphore) -> Dict:
+        """Analyze content using the configured GPT model"""
+        prompt = self.build_prompt(content, file_path, analysis_type)
         
-        prompt = self.analysis_prompts[analysis_type].format(
-            file_path=file_path,
-            content=content[:3000]  # Limit content for token efficiency
-        )
+        # Unchanged files reuse the previous answer, even without an API key
+        cache_key = self._cache_key(prompt, analysis_type)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
+        if not self.client:
+            return {"error": "OpenAI API key not found"}
         
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=500,
-                temperature=0.3
-            )
-            
-            result_text = response.choices[0].message.content
-            try:
-                result = json.loads(result_text)
-                return result
-            except json.JSONDecodeError:
-                # Fallback parsing if JSON is malformed
-                return {
-                    "error": "Failed to parse GPT response",
-                    "raw_response": result_text,
-                    "analysis_type": analysis_type
-                }
+            result_text = await self._complete(self._request_body(prompt), semaphore)
+            return self._parse_result(result_text, analysis_type, cache_key)
         except Exception as e:
             return {"error": f"GPT analysis failed: {str(e)}"}
 
-    def analyze_repository_semantic(self, repo_path: str = '.') -> Dict:
-        """Perform semantic analysis of repository"""
-        repo_path = Path(repo_path)
-        results = {
-            'timestamp': datetime.now().isoformat(),
-            'files_analyzed': 0,
-            'rule_conflicts': [],
-            'best_practice_violations': [],
-            'cursor_compatibility_issues': [],
-            'high_complexity_files': [],
-            'analysis_errors': [],
-            'file_analysis': {}
-        }
+    async def _complete(self, body: Dict, semaphore: asyncio.Semaphore) -> str:
+        """Run one realtime request, retrying rate-limit and transient errors with backoff"""
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                async with semaphore, self.limiter:
+                    return await self._stream_completion(body)
+            except (openai.RateLimitError, openai.InternalServerError, openai.APIConnectionError) as e:
+                if attempt == MAX_RETRIES:
+                    raise
+                if isinstance(e, openai.RateLimitError):
+                    # Over the server's limit: hold back every request, not just this one
+                    self.limiter.drain()
+                # Exponential backoff with jitter, outside the semaphore
+                await asyncio.sleep(min(60, 2 ** attempt) + random.random())
+
+    async def analyze_group_with_gpt(self, files: List[Tuple[Path, str]],
+                                     semaphore: asyncio.Semaphore) -> Dict[str, Dict]:
+        """Analyze several small files in one request; returns results by file path
+        
+        Each result is cached under its single-file key, so later runs can reuse it
+        whichever files it is grouped with. Files missing from the reply, or from
+        an unparseable reply, are left out; API errors propagate.
+        """
+        prompt = self.build_group_prompt(files)
+        result_text = await self._complete(self._request_body(prompt, GROUP_RESPONSE_SCHEMA, len(files)), semaphore)
+        try:
+            entries = list(loads_json(result_text)['files'])
+        except (ValueError, KeyError, TypeError):
+            return {}
+        
+        expected = {str(file_path): content for file_path, content in files}
+        analyses = {}
+        for entry in entries:
+            path = entry.pop('file', None) if isinstance(entry, dict) else None
+            if path not in expected or path in analyses:
+                continue
+            cache_key = self._cache_key(self.build_prompt(expected[path], path, 'combined'), 'combined')
+            self._cache_put(cache_key, entry)
+            analyses[path] = entry
+        return analyses
+
+    async def run_batch(self, requests: Dict[str, str], timeout: float) -> Optional[Dict[str, str]]:
+        """Submit prompts through the Batch API and return reply text by custom_id
+        
+        A batch still running after `timeout` seconds is cancelled and whatever it
+        finished is returned. Returns None if there is no output at all or on an
+        API error; callers send every missing custom_id in realtime.
+        """
+        try:
+            return await self._run_batch(requests, timeout)
+        except openai.OpenAIError as e:
+            print(f"⚠️  Batch API request failed, falling back to realtime calls: {e}")
+            return None
+
+    async def _run_batch(self, requests: Dict[str, str], timeout: float) -> Optional[Dict[str, str]]:
+        """Upload, submit and poll one batch"""
+        lines = [
+            dumps_json({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._request_body(prompt)
+            })
+            for custom_id, prompt in requests.items()
+        ]
+        batch_file = await self.client.files.create(
+            file=('complexity-batch.jsonl', b"\n".join(lines)),
+            purpose='batch'
+        )
+        batch = await self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint='/v1/chat/completions',
+            completion_window='24h'
+        )
+        print(f"⏳ Submitted batch {batch.id} with {len(lines)} requests")
+        
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        finished = ('completed', 'failed', 'expired', 'cancelled')
+        while batch.status not in finished:
+            if loop.time() >= deadline:
+                # A cancelled batch still publishes the replies it finished so far
+                print(f"⚠️  Batch {batch.id} did not finish in {timeout:.0f}s, cancelling")
+                await self.client.batches.cancel(batch.id)
+                deadline = loop.time() + BATCH_CANCEL_TIMEOUT
+                while batch.status not in finished:
+                    if loop.time() >= deadline:
+                        print(f"⚠️  Batch {batch.id} is still '{batch.status}', giving up on it")
+                        return None
+                    await asyncio.sleep(BATCH_POLL_INTERVAL)
+                    batch = await self.client.batches.retrieve(batch.id)
+                break
+            await asyncio.sleep(BATCH_POLL_INTERVAL)
+            batch = await self.client.batches.retrieve(batch.id)
         
+        if batch.status != 'completed':
+            print(f"⚠️  Batch {batch.id} ended with status '{batch.status}'")
+        if not batch.output_file_id:
+            return None
+        
+        output = await self.client.files.content(batch.output_file_id)
+        replies = {}
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            try:
+                item = loads_json(line)
+                response = item.get('response') or {}
+                if response.get('status_code') == 200:
+                    content = response['body']['choices'][0]['message']['content']
+                    if isinstance(content, str):
+                        replies[item['custom_id']] = content
+            except (ValueError, KeyError, IndexError, TypeError, AttributeError):
+                # A malformed line only sends that request to realtime
+                continue
+        return replies
+
+    def collect_files(self, repo_path: Path) -> List[Path]:
+        """List rule and documentation files to analyze, without duplicates"""
         # Focus on rule files and documentation
         rule_patterns = [
             '.cursor/rules/**/*.md',
@@ -133,85 +535,284 @@ class GPTComplexityAnalyzer:
             '*.md'  # Also check root level markdown files
         ]
         
-        analyzed_files = set()
-        
+        files = {}
         for pattern in rule_patterns:
             for file_path in repo_path.glob(pattern):
-                if file_path.is_file() and str(file_path) not in analyzed_files:
-                    try:
-                        content = file_path.read_text(encoding='utf-8')
-                        analyzed_files.add(str(file_path))
-                        results['files_analyzed'] += 1
-                        
-                        file_analysis = {
-                            'file_path': str(file_path),
-                            'size_kb': len(content) / 1024,
-                            'line_count': len(content.split('\n')),
-                            'conflicts': [],
-                            'violations': [],
-                            'cursor_issues': [],
-                            'complexity_rating': 0,
-                            'cursor_compatibility': 0
-                        }
-                        
-                        # Analyze rule conflicts
-                        conflict_analysis = self.analyze_with_gpt(
-                            content, str(file_path), 'rule_conflicts'
-                        )
-                        if 'conflicts' in conflict_analysis:
-                            file_analysis['conflicts'] = conflict_analysis['conflicts']
-                            results['rule_conflicts'].extend(conflict_analysis['conflicts'])
-                        
-                        if 'complexity_rating' in conflict_analysis:
-                            file_analysis['complexity_rating'] = conflict_analysis['complexity_rating']
-                        
-                        # Analyze best practices
-                        practice_analysis = self.analyze_with_gpt(
-                            content, str(file_path), 'best_practices'
-                        )
-                        if 'violations' in practice_analysis:
-                            file_analysis['violations'] = practice_analysis['violations']
-                            results['best_practice_violations'].extend(practice_analysis['violations'])
-                        
-                        # Analyze Cursor compatibility
-                        cursor_analysis = self.analyze_with_gpt(
-                            content, str(file_path), 'cursor_compatibility'
-                        )
-                        if 'issues' in cursor_analysis:
-                            file_analysis['cursor_issues'] = cursor_analysis['issues']
-                            results['cursor_compatibility_issues'].extend(cursor_analysis['issues'])
-                        
-                        if 'cursor_compatibility' in cursor_analysis:
-                            file_analysis['cursor_compatibility'] = cursor_analysis['cursor_compatibility']
-                        
-                        # Flag high complexity
-                        if file_analysis['complexity_rating'] > 7:
-                            results['high_complexity_files'].append({
-                                'file': str(file_path),
-                                'complexity': file_analysis['complexity_rating'],
-                                'cursor_compatibility': file_analysis['cursor_compatibility'],
-                                'size_kb': file_analysis['size_kb'],
-                                'line_count': file_analysis['line_count']
-                            })
-                        
-                        results['file_analysis'][str(file_path)] = file_analysis
-                        
-                        # Add delay to avoid rate limiting
-                        time.sleep(0.5)
-                        
-                    except Exception as e:
-                        results['analysis_errors'].append({
-                            'file': str(file_path),
-                            'error': str(e)
-                        })
+                if file_path.is_file():
+                    files.setdefault(str(file_path), file_path)
+        return list(files.values())
+
+    def build_file_analysis(self, file_path: Path, content: str, analysis: Dict) -> Dict:
+        """Turn a combined GPT result into the per-file analysis record"""
+        file_analysis = {
+            'file_path': str(file_path),
+            'size_kb': len(content) / 1024,
+            'line_count': content.count('\n') + 1,
+            'conflicts': [],
+            'violations': [],
+            'cursor_issues': [],
+            'complexity_rating': 0,
+            'cursor_compatibility': 0
+        }
+        
+        sections = [analysis.get(key) for key in ('rule_conflicts', 'best_practices', 'cursor_compatibility')]
+        conflict_analysis, practice_analysis, cursor_analysis = (
+            section if isinstance(section, dict) else {} for section in sections
+        )
+        
+        # Analyze rule conflicts
+        if 'conflicts' in conflict_analysis:
+            file_analysis['conflicts'] = conflict_analysis['conflicts']
+        
+        if 'complexity_rating' in conflict_analysis:
+            file_analysis['complexity_rating'] = conflict_analysis['complexity_rating']
+        
+        # Analyze best practices
+        if 'violations' in practice_analysis:
+            file_analysis['violations'] = practice_analysis['violations']
+        
+        # Analyze Cursor compatibility
+        if 'issues' in cursor_analysis:
+            file_analysis['cursor_issues'] = cursor_analysis['issues']
+        
+        if 'cursor_compatibility' in cursor_analysis:
+            file_analysis['cursor_compatibility'] = cursor_analysis['cursor_compatibility']
+        
+        return file_analysis
+
+    async def analyze_file(self, file_path: Path, semaphore: asyncio.Semaphore) -> Dict:
+        """Run the semantic analysis for one file"""
+        content = await asyncio.to_thread(file_path.read_text, encoding='utf-8')
+        
+        # One request covers all three analyses
+        analysis = await self.analyze_with_gpt(content, str(file_path), 'combined', semaphore)
+        return self.build_file_analysis(file_path, content, analysis)
+
+    def analyze_files_realtime(self, files: List[Path], semaphore: asyncio.Semaphore) -> List[asyncio.Task]:
+        """Start realtime analysis tasks, one per file and in file order
+        
+        Small files are grouped so several share one request.
+        """
+        small = [file_path for file_path in files if file_path.stat().st_size < SMALL_FILE_BYTES]
+        small_set = set(small)
+        tasks = {file_path: asyncio.ensure_future(self.analyze_file(file_path, semaphore))
+                 for file_path in files if file_path not in small_set}
+        for i in range(0, len(small), GROUP_SIZE):
+            group = small[i:i + GROUP_SIZE]
+            tasks.update(zip(group, self._analyze_file_group(group, semaphore)))
+        return [tasks[file_path] for file_path in files]
+
+    def _analyze_file_group(self, files: List[Path], semaphore: asyncio.Semaphore) -> List[asyncio.Task]:
+        """Per-file tasks backed by one shared grouped request"""
+        async def run_group():
+            contents = await asyncio.gather(
+                *(asyncio.to_thread(file_path.read_text, encoding='utf-8') for file_path in files),
+                return_exceptions=True
+            )
+            
+            # Only files without a cached answer go into the grouped request
+            analyses = {}
+            misses = []
+            for file_path, content in zip(files, contents):
+                if isinstance(content, Exception):
+                    continue
+                cache_key = self._cache_key(self.build_prompt(content, str(file_path), 'combined'), 'combined')
+                cached = self._cache_get(cache_key)
+                if cached is not None:
+                    analyses[str(file_path)] = cached
+                else:
+                    misses.append((file_path, content))
+            group_error = None
+            if len(misses) > 1:
+                try:
+                    analyses.update(await self.analyze_group_with_gpt(misses, semaphore))
+                except openai.OpenAIError as e:
+                    # Retrying each file on its own would only add load to a failing API
+                    print(f"⚠️  Grouped GPT request failed for {len(misses)} files: {e}")
+                    group_error = e
+            return contents, analyses, group_error
         
+        shared = asyncio.ensure_future(run_group())
+        
+        async def finish(index: int) -> Dict:
+            contents, analyses, group_error = await shared
+            file_path, content = files[index], contents[index]
+            if isinstance(content, Exception):
+                raise content
+            analysis = analyses.get(str(file_path))
+            if analysis is None and group_error is not None:
+                raise RuntimeError(f"GPT analysis failed: {group_error}")
+            if analysis is None:
+                # Lone miss, or left out of the grouped reply: ask on its own
+                analysis = await self.analyze_with_gpt(content, str(file_path), 'combined', semaphore)
+            return self.build_file_analysis(file_path, content, analysis)
+        
+        return [asyncio.ensure_future(finish(index)) for index in range(len(files))]
+
+    async def analyze_files_batch(self, files: List[Path], semaphore: asyncio.Semaphore,
+                                  timeout: float) -> List[asyncio.Task]:
+        """Analyze files through the Batch API, falling back to realtime calls
+        
+        Returns one task per file, in file order.
+        """
+        contents = await asyncio.gather(
+            *(asyncio.to_thread(file_path.read_text, encoding='utf-8') for file_path in files),
+            return_exceptions=True
+        )
+        
+        # Cached prompts are answered locally; only the rest go into the batch
+        answers = {}
+        pending = {}
+        for file_path, content in zip(files, contents):
+            if isinstance(content, Exception):
+                continue
+            prompt = self.build_prompt(content, str(file_path), 'combined')
+            cache_key = self._cache_key(prompt, 'combined')
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                answers[str(file_path)] = cached
+            else:
+                pending[f"{file_path}:combined"] = (file_path, prompt, cache_key)
+        
+        if pending:
+            replies = await self.run_batch(
+                {custom_id: prompt for custom_id, (_, prompt, _) in pending.items()}, timeout
+            ) or {}
+            for custom_id, (file_path, _, cache_key) in pending.items():
+                if custom_id in replies:
+                    answers[str(file_path)] = self._parse_result(replies[custom_id], 'combined', cache_key)
+        
+        async def finish(file_path: Path, content) -> Dict:
+            if isinstance(content, Exception):
+                raise content
+            analysis = answers.get(str(file_path))
+            if analysis is None:
+                # Missing from the batch output: ask in realtime instead
+                analysis = await self.analyze_with_gpt(content, str(file_path), 'combined', semaphore)
+            return self.build_file_analysis(file_path, content, analysis)
+        
+        return [asyncio.ensure_future(finish(file_path, content)) for file_path, content in zip(files, contents)]
+
+    async def analyze_repository_semantic_async(self, repo_path: str = '.', realtime: bool = True,
+                                                batch_timeout: float = 1800,
+                                                output: Optional[str] = None) -> Dict:
+        """Perform semantic analysis of repository with concurrent API calls
+        
+        With `output`, per-file analyses are streamed to that JSON file as they
+        complete and left out of the returned dict.
+        """
+        repo_path = Path(repo_path)
+        results = {
+            'timestamp': datetime.now().isoformat(),
+            'files_analyzed': 0,
+            'rule_conflicts': Counter(),
+            'best_practice_violations': Counter(),
+            'cursor_compatibility_issues': Counter(),
+            'high_complexity_files': [],
+            'analysis_errors': [],
+            'file_analysis': {}
+        }
+        
+        # Rate limiting is handled by the semaphore, token bucket and 429 backoff
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        files = self.collect_files(repo_path)
+        if not self.client:
+            tasks = [asyncio.ensure_future(self.analyze_file(file_path, semaphore)) for file_path in files]
+        elif realtime:
+            tasks = self.analyze_files_realtime(files, semaphore)
+        else:
+            tasks = await self.analyze_files_batch(files, semaphore, batch_timeout)
+        
+        writer = None
+        if output:
+            writer = _StreamingResultsWriter(output)
+            del results['file_analysis']
+        try:
+            await self._collect_results(files, tasks, results, writer)
+        except BaseException:
+            if writer:
+                writer.abort()
+            raise
+        # Only after a complete pass, so an interrupted run keeps the cache intact
+        self._prune_cache()
+        if writer:
+            # Counters serve the console; the file keeps plain lists of entries
+            writer.close({key: list(value.elements()) if isinstance(value, Counter) else value
+                          for key, value in results.items()})
         return results
 
+    async def _collect_results(self, files: List[Path], tasks: List[asyncio.Task], results: Dict,
+                               writer: Optional[_StreamingResultsWriter]):
+        """Fold per-file analyses into the results as they complete
+        
+        Entries reach the writer in completion order, so a slow file never holds
+        finished ones in memory; the aggregate lists are put back in file order.
+        """
+        async def outcome(file_path: Path, task: asyncio.Task) -> Tuple[Path, Optional[Dict], Optional[Exception]]:
+            try:
+                return file_path, await task, None
+            except Exception as e:
+                return file_path, None, e
+        
+        for next_done in asyncio.as_completed([outcome(file_path, task) for file_path, task in zip(files, tasks)]):
+            file_path, file_analysis, error = await next_done
+            if error is not None:
+                results['analysis_errors'].append({
+                    'file': str(file_path),
+                    'error': str(error)
+                })
+                continue
+            
+            results['files_analyzed'] += 1
+            results['rule_conflicts'].update(file_analysis['conflicts'])
+            results['best_practice_violations'].update(file_analysis['violations'])
+            results['cursor_compatibility_issues'].update(file_analysis['cursor_issues'])
+            
+            # Flag high complexity
+            if file_analysis['complexity_rating'] > 7:
+                results['high_complexity_files'].append({
+                    'file': str(file_path),
+                    'complexity': file_analysis['complexity_rating'],
+                    'cursor_compatibility': file_analysis['cursor_compatibility'],
+                    'size_kb': file_analysis['size_kb'],
+                    'line_count': file_analysis['line_count']
+                })
+            
+            if writer:
+                writer.add(str(file_path), file_analysis)
+            else:
+                results['file_analysis'][str(file_path)] = file_analysis
+        
+        order = {str(file_path): index for index, file_path in enumerate(files)}
+        for key in ('analysis_errors', 'high_complexity_files'):
+            results[key].sort(key=lambda item: order[item['file']])
+        if not writer:
+            results['file_analysis'] = {key: results['file_analysis'][key]
+                                        for key in sorted(results['file_analysis'], key=order.get)}
+
+    def analyze_repository_semantic(self, repo_path: str = '.', realtime: bool = True,
+                                    batch_timeout: float = 1800, output: Optional[str] = None) -> Dict:
+        """Perform semantic analysis of repository"""
+        return asyncio.run(self.analyze_repository_semantic_async(repo_path, realtime, batch_timeout, output))
+
 def main():
-    analyzer = GPTComplexityAnalyzer()
-    results = analyzer.analyze_repository_semantic()
+    parser = argparse.ArgumentParser(description="GPT semantic complexity analysis")
+    parser.add_argument('--realtime', action='store_true',
+                        help="use realtime chat completions instead of the (cheaper) Batch API")
+    parser.add_argument('--batch-timeout', type=float, default=1800,
+                        help="seconds to wait for a batch before falling back to realtime calls")
+    parser.add_argument('--model', default="gpt-4o-mini",
+                        help="OpenAI chat model to use (default: gpt-4o-mini)")
+    parser.add_argument('--rpm', type=float, default=500,
+                        help="maximum realtime requests per minute (default: 500)")
+    args = parser.parse_args()
     
-    print("🧠 GPT-3.5 SEMANTIC ANALYSIS")
+    analyzer = GPTComplexityAnalyzer(model=args.model, rpm=args.rpm)
+    # Per-file analyses are written to disk as they complete
+    results = analyzer.analyze_repository_semantic(realtime=args.realtime, batch_timeout=args.batch_timeout,
+                                                   output='gpt-complexity-results.json')
+    
+    print(f"🧠 GPT SEMANTIC ANALYSIS ({analyzer.model})")
     print("=" * 50)
     print(f"Timestamp: {results['timestamp']}")
     print(f"Files analyzed: {results['files_analyzed']}")
@@ -222,29 +823,25 @@ def main():
             print(f"  - {error['file']}: {error['error']}")
     
     if results['rule_conflicts']:
-        print(f"\n⚠️  RULE CONFLICTS: {len(set(results['rule_conflicts']))}")
-        for conflict in set(results['rule_conflicts']):
-            print(f"  - {conflict}")
+        print(f"\n⚠️  RULE CONFLICTS: {len(results['rule_conflicts'])}")
+        for conflict, count in results['rule_conflicts'].most_common():
+            print(f"  - {conflict} ({count}x)")
     
     if results['best_practice_violations']:
-        print(f"\n❌ BEST PRACTICE VIOLATIONS: {len(set(results['best_practice_violations']))}")
-        for violation in set(results['best_practice_violations']):
-            print(f"  - {violation}")
+        print(f"\n❌ BEST PRACTICE VIOLATIONS: {len(results['best_practice_violations'])}")
+        for violation, count in results['best_practice_violations'].most_common():
+            print(f"  - {violation} ({count}x)")
     
     if results['cursor_compatibility_issues']:
-        print(f"\n🔧 CURSOR COMPATIBILITY ISSUES: {len(set(results['cursor_compatibility_issues']))}")
-        for issue in set(results['cursor_compatibility_issues']):
-            print(f"  - {issue}")
+        print(f"\n🔧 CURSOR COMPATIBILITY ISSUES: {len(results['cursor_compatibility_issues'])}")
+        for issue, count in results['cursor_compatibility_issues'].most_common():
+            print(f"  - {issue} ({count}x)")
     
     if results['high_complexity_files']:
         print(f"\n🚨 HIGH COMPLEXITY FILES: {len(results['high_complexity_files'])}")
         for file_info in sorted(results['high_complexity_files'], key=lambda x: x['complexity'], reverse=True):
             print(f"  - {file_info['file']}: {file_info['complexity']}/10 (Cursor: {file_info['cursor_compatibility']}/10)")
     
-    # Save results to JSON file
-    with open('gpt-complexity-results.json', 'w') as f:
-        json.dump(results, f, indent=2)
-    
     print(f"\n📄 Results saved to: gpt-complexity-results.json")
 
 if __name__ == "__main__":
@@ -7,9 +7,52 @@ Analyzes markdown files for complexity, conflicts, and best practice violations.
 import os
 import re
 import json
+import hashlib
+import mmap
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+from _complexity_cache import dumps_json, loads_json
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+
+# RE2 has no lookaround; such patterns stay on the backtracking engine
+_LOOKAROUND_RE = re.compile(r'\(\?<?[=!]')
+
+def _compile_caseless(pattern: str):
+    """Compile a case-insensitive pattern with RE2 when available, else with re"""
+    if re2 is not None and not _LOOKAROUND_RE.search(pattern):
+        try:
+            return re2.compile(f'(?i){pattern}')
+        except Exception:
+            pass
+    return re.compile(pattern, re.IGNORECASE)
+
+PARALLEL_MIN_FILES = 64  # Below this, process start-up costs more than it saves
+CACHE_FILE = '.complexity-cache.json'
+MMAP_MIN_BYTES = 1 << 20  # Files at least this large are decoded from a memory map
+SKIP_DIRS = {'.git', 'node_modules', '__pycache__'}
+
+def find_markdown_files(repo_path: Path) -> List[Path]:
+    """List markdown files under repo_path in sorted order, skipping tool directories"""
+    paths = []
+    for root, dirs, files in os.walk(repo_path):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        for name in files:
+            if name.endswith('.md'):
+                paths.append(Path(root, name))
+    return sorted(path for path in paths if path.is_file())
 
 class MarkdownComplexityAnalyzer:
     def __init__(self):
@@ -42,19 +85,48 @@ class MarkdownComplexityAnalyzer:
             (r'pd\.', 'Avoid pandas aliasing (pd.)'),
             (r'as pd', 'Avoid pandas aliasing (as pd)'),
         ]
+        
+        # Compile once; analyze_file runs for every markdown file in the repo
+        self._conflict_res = [(_compile_caseless(p), d) for p, d in self.conflict_patterns]
+        self._violation_res = [(_compile_caseless(p), v) for p, v in self.best_practice_violations]
+        self._header_re = re.compile(r'^#{2,}', re.MULTILINE)
+        
+        # Substrings counted by the indicators below, each scanned once per file.
+        # str.count semantics (substring, non-overlapping, per keyword) are kept
+        # so scores stay comparable with earlier runs.
+        self._keywords = ('graph', '```mermaid', '```', 'if', 'else', 'switch', 'Step', 'Phase', 'MODE', 'mermaid')
+
+    def read_file(self, file_path: Path) -> str:
+        """Read a markdown file, replacing undecodable bytes"""
+        if file_path.stat().st_size >= MMAP_MIN_BYTES:
+            # Decode straight from the page cache, skipping the intermediate bytes copy.
+            # Files with '\r' need text-mode newline translation, so they take the normal path.
+            with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm.find(b'\r') == -1:
+                    return str(mm, 'utf-8', errors='replace')
+        return file_path.read_text(encoding='utf-8', errors='replace')
+
+    def count_keywords(self, contents: List[str]) -> List[Dict]:
+        """Count indicator keywords in each text, vectorized with Arrow when available"""
+        if pa is None or len(contents) < 2:
+            return [{keyword: content.count(keyword) for keyword in self._keywords} for content in contents]
+        
+        # count_substring matches str.count: literal, non-overlapping occurrences
+        arr = pa.array(contents, type=pa.large_string())
+        columns = [pc.count_substring(arr, pattern=keyword).to_pylist() for keyword in self._keywords]
+        return [dict(zip(self._keywords, row)) for row in zip(*columns)]
 
-    def analyze_file(self, file_path: Path) -> Dict:
+    def analyze_file(self, file_path: Path, content: Optional[str] = None,
+                     counts: Optional[Dict] = None) -> Dict:
         """Analyze a single markdown file for complexity"""
-        try:
-            content = file_path.read_text(encoding='utf-8')
-        except UnicodeDecodeError:
-            content = file_path.read_text(encoding='latin-1')
+        if content is None:
+            content = self.read_file(file_path)
         
         analysis = {
             'file_path': str(file_path),
             'complexity_score': 0,
             'size_kb': len(content) / 1024,
-            'line_count': len(content.split('\n')),
+            'line_count': content.count('\n') + 1,
             'issues': [],
             'conflicts': [],
             'best_practice_violations': [],
@@ -62,53 +134,75 @@ class MarkdownComplexityAnalyzer:
         }
         
         # Calculate complexity score
-        mermaid_count = content.count('graph') + content.count('```mermaid')
-        analysis['complexity_breakdown']['mermaid_diagrams'] = mermaid_count
-        analysis['complexity_score'] += mermaid_count * self.complexity_indicators['mermaid_diagrams']
-        
-        code_blocks = content.count('```')
-        analysis['complexity_breakdown']['code_blocks'] = code_blocks
-        analysis['complexity_score'] += code_blocks * self.complexity_indicators['code_blocks']
-        
-        nested_headers = len(re.findall(r'^#{2,}', content, re.MULTILINE))
-        analysis['complexity_breakdown']['nested_headers'] = nested_headers
-        analysis['complexity_score'] += nested_headers * self.complexity_indicators['nested_headers']
-        
-        conditional_logic = content.count('if') + content.count('else') + content.count('switch')
-        analysis['complexity_breakdown']['conditional_logic'] = conditional_logic
-        analysis['complexity_score'] += conditional_logic * self.complexity_indicators['conditional_logic']
+        if counts is None:
+            counts = {keyword: content.count(keyword) for keyword in self._keywords}
         
-        workflow_steps = content.count('Step') + content.count('Phase')
-        analysis['complexity_breakdown']['workflow_steps'] = workflow_steps
-        analysis['complexity_score'] += workflow_steps * self.complexity_indicators['workflow_steps']
-        
-        mode_transitions = content.count('MODE') + content.count('switch')
-        analysis['complexity_breakdown']['mode_transitions'] = mode_transitions
-        analysis['complexity_score'] += mode_transitions * self.complexity_indicators['mode_transitions']
+        breakdown = {
+            'mermaid_diagrams': counts['graph'] + counts['```mermaid'],
+            'code_blocks': counts['```'],
+            'nested_headers': len(self._header_re.findall(content)),
+            'conditional_logic': counts['if'] + counts['else'] + counts['switch'],
+            'workflow_steps': counts['Step'] + counts['Phase'],
+            'mode_transitions': counts['MODE'] + counts['switch'],
+            'visual_maps': counts['mermaid'] + counts['graph'],
+        }
+        analysis['complexity_breakdown'] = breakdown
         
-        visual_maps = content.count('mermaid') + content.count('graph')
-        analysis['complexity_breakdown']['visual_maps'] = visual_maps
-        analysis['complexity_score'] += visual_maps * self.complexity_indicators['visual_maps']
+        # Weighted sum of the breakdown, with the weights bound once per file
+        weights = self.complexity_indicators
+        score = sum(count * weights[name] for name, count in breakdown.items())
         
         # Size complexity
-        analysis['complexity_score'] += analysis['size_kb'] * self.complexity_indicators['file_size_kb']
+        score += analysis['size_kb'] * weights['file_size_kb']
         
         # Check for critical rules
-        for pattern, description in self.conflict_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
+        critical_weight = weights['critical_rules']
+        for pattern, description in self._conflict_res:
+            matches = pattern.findall(content)
             if matches:
-                analysis['complexity_score'] += len(matches) * self.complexity_indicators['critical_rules']
+                score += len(matches) * critical_weight
                 analysis['conflicts'].append(f"{description}: {len(matches)} instances")
+        analysis['complexity_score'] = score
         
         # Check best practice violations
-        for pattern, violation in self.best_practice_violations:
-            matches = re.findall(pattern, content, re.IGNORECASE)
+        for pattern, violation in self._violation_res:
+            matches = pattern.findall(content)
             if matches:
                 analysis['best_practice_violations'].append(f"{violation}: {len(matches)} instances")
         
         return analysis
 
-    def analyze_repository(self, repo_path: str = '.') -> Dict:
+    def config_hash(self) -> str:
+        """Fingerprint of everything that affects a file's analysis"""
+        config = [self.complexity_indicators, self.conflict_patterns,
+                  self.best_practice_violations, self._keywords]
+        return hashlib.sha1(json.dumps(config, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def load_cache(self, cache_file: str) -> Dict:
+        """Load cached per-file analyses, dropping them if the rules changed"""
+        try:
+            cache = loads_json(Path(cache_file).read_bytes())
+        except (OSError, ValueError):
+            return {}
+        if cache.get('config') != self.config_hash():
+            return {}
+        return cache.get('files', {})
+
+    def save_cache(self, cache_file: str, entries: Dict):
+        """Persist per-file analyses for the next run"""
+        try:
+            Path(cache_file).write_bytes(dumps_json({'config': self.config_hash(), 'files': entries}))
+        except OSError:
+            pass
+
+    def analyze_paths(self, paths: List[Path], contents: List[str]) -> List[Dict]:
+        """Analyze files in order, in a process pool for large batches"""
+        if len(paths) < PARALLEL_MIN_FILES:
+            return list(map(self.analyze_file, paths, contents, self.count_keywords(contents)))
+        with ProcessPoolExecutor(initializer=_init_worker) as ex:
+            return list(ex.map(_analyze_in_worker, paths, contents, chunksize=16))
+
+    def analyze_repository(self, repo_path: str = '.', cache_file: Optional[str] = CACHE_FILE) -> Dict:
         """Analyze entire repository"""
         repo_path = Path(repo_path)
         results = {
@@ -116,34 +210,61 @@ class MarkdownComplexityAnalyzer:
             'files_analyzed': 0,
             'total_complexity': 0,
             'high_complexity_files': [],
-            'conflicts_found': [],
-            'best_practice_violations': [],
+            'conflicts_found': Counter(),
+            'best_practice_violations': Counter(),
             'recommendations': [],
             'file_analysis': {},
             'summary': {}
         }
         
-        # Analyze all markdown files
-        for file_path in repo_path.rglob('*.md'):
-            if file_path.is_file():
-                analysis = self.analyze_file(file_path)
-                results['files_analyzed'] += 1
-                results['total_complexity'] += analysis['complexity_score']
-                results['file_analysis'][str(file_path)] = analysis
-                
-                # Flag high complexity files (>50 score)
-                if analysis['complexity_score'] > 50:
-                    results['high_complexity_files'].append({
-                        'file': str(file_path),
-                        'score': analysis['complexity_score'],
-                        'size_kb': analysis['size_kb'],
-                        'line_count': analysis['line_count'],
-                        'issues': analysis['issues']
-                    })
-                
-                # Collect conflicts and violations
-                results['conflicts_found'].extend(analysis['conflicts'])
-                results['best_practice_violations'].extend(analysis['best_practice_violations'])
+        # Analyze all markdown files, reusing cached results for unchanged ones
+        paths = find_markdown_files(repo_path)
+        cache = self.load_cache(cache_file) if cache_file else {}
+        entries = {}
+        misses = []
+        for file_path in paths:
+            key = str(file_path)
+            st = file_path.stat()
+            entry = cache.get(key)
+            if entry and entry['mtime_ns'] == st.st_mtime_ns and entry['size'] == st.st_size:
+                entries[key] = entry
+                continue
+            
+            # A fresh checkout (e.g. in CI) resets mtimes, so fall back to the content hash
+            content = self.read_file(file_path)
+            digest = hashlib.sha1(content.encode('utf-8')).hexdigest()
+            if entry and entry['sha1'] == digest:
+                entries[key] = dict(entry, mtime_ns=st.st_mtime_ns, size=st.st_size)
+            else:
+                misses.append((file_path, content, {'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'sha1': digest}))
+        
+        if misses:
+            miss_paths, miss_contents, stats = zip(*misses)
+            for file_path, stat, analysis in zip(miss_paths, stats, self.analyze_paths(miss_paths, miss_contents)):
+                entries[str(file_path)] = dict(stat, analysis=analysis)
+        
+        if cache_file:
+            self.save_cache(cache_file, entries)
+        
+        for file_path in paths:
+            analysis = entries[str(file_path)]['analysis']
+            results['files_analyzed'] += 1
+            results['total_complexity'] += analysis['complexity_score']
+            results['file_analysis'][str(file_path)] = analysis
+            
+            # Flag high complexity files (>50 score)
+            if analysis['complexity_score'] > 50:
+                results['high_complexity_files'].append({
+                    'file': str(file_path),
+                    'score': analysis['complexity_score'],
+                    'size_kb': analysis['size_kb'],
+                    'line_count': analysis['line_count'],
+                    'issues': analysis['issues']
+                })
+            
+            # Collect conflicts and violations
+            results['conflicts_found'].update(analysis['conflicts'])
+            results['best_practice_violations'].update(analysis['best_practice_violations'])
         
         # Generate recommendations
         if results['total_complexity'] > 200:
@@ -167,6 +288,17 @@ class MarkdownComplexityAnalyzer:
         
         return results
 
+_worker_analyzer = None
+
+def _init_worker():
+    """Build one analyzer per worker process instead of pickling it per task"""
+    global _worker_analyzer
+    _worker_analyzer = MarkdownComplexityAnalyzer()
+
+def _analyze_in_worker(file_path: Path, content: str) -> Dict:
+    """Process pool entry point for MarkdownComplexityAnalyzer.analyze_file"""
+    return _worker_analyzer.analyze_file(file_path, content)
+
 def main():
     analyzer = MarkdownComplexityAnalyzer()
     results = analyzer.analyze_repository()
@@ -189,12 +321,13 @@ def main():
     
     if results['conflicts_found']:
         print("\n⚠️  CONFLICTS FOUND:")
-        for conflict in set(results['conflicts_found']):
+        # Entries already carry their per-file instance counts, so no (Nx) suffix
+        for conflict, _ in results['conflicts_found'].most_common():
             print(f"  - {conflict}")
     
     if results['best_practice_violations']:
         print("\n❌ BEST PRACTICE VIOLATIONS:")
-        for violation in set(results['best_practice_violations']):
+        for violation, _ in results['best_practice_violations'].most_common():
             print(f"  - {violation}")
     
     if results['recommendations']:
@@ -202,9 +335,11 @@ def main():
         for rec in results['recommendations']:
             print(f"  - {rec}")
     
-    # Save results to JSON file
-    with open('static-complexity-results.json', 'w') as f:
-        json.dump(results, f, indent=2)
+    # Save results to JSON file; the Counters go back to plain lists of entries
+    payload = dict(results,
+                   conflicts_found=list(results['conflicts_found'].elements()),
+                   best_practice_violations=list(results['best_practice_violations'].elements()))
+    Path('static-complexity-results.json').write_bytes(dumps_json(payload, indent=True))
     
     print(f"\n📄 Results saved to: static-complexity-results.json")
 